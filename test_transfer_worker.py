@@ -4,24 +4,119 @@ Tests happy path, edge cases, and negative scenarios.
 """
 
 import asyncio
+import hashlib
+import itertools
 import json
+import logging
+import shutil
+import time
 import uuid
-from datetime import datetime, timezone
-from pathlib import Path
+from dataclasses import replace
 import pytest
-from unittest.mock import Mock, AsyncMock, patch
+from unittest.mock import Mock, AsyncMock, call, patch
 
+import transfer_worker
 from transfer_worker import (
+    CHUNK_SIZE,
+    PIPELINE_DEPTH,
     TransferWorker,
     TransferEvent,
+    IdempotencyCache,
     StorageSimulator,
     QueueSimulator,
     RetryConfig,
-    CloudProvider,
     StructuredLogger,
     MetricsCollector
 )
 
+# Cheap unique IDs; tests don't depend on the UUID format
+_ids = itertools.count()
+
+def _mk_id():
+    return f"id-{next(_ids)}"
+
+# Fixed event timestamp keeps tests deterministic
+FROZEN_TS = "2024-01-01T00:00:00+00:00"
+
+# SHA-256 of the dummy content the simulator serves for the sample event's source key
+SAMPLE_CHECKSUM = hashlib.sha256(b"Simulated content for test-file.txt").hexdigest()
+
+# Fields every structured log line must carry
+LOG_REQUIRED_FIELDS = frozenset({
+    "timestamp", "level", "service", "message", "correlation_id", "event_id"
+})
+
+# Base event payload; tests derive variants by overriding individual keys
+BASE_EVENT = {
+    "schemaVersion": "1.0.0",
+    "eventId": "event-0",
+    "correlationId": "corr-0",
+    "timestamp": FROZEN_TS,
+    "source": {
+        "provider": "aws_s3",
+        "bucket": "source-bucket",
+        "key": "file-0.txt"
+    },
+    "destination": {
+        "provider": "gcp_gcs",
+        "bucket": "dest-bucket",
+        "key": "output-0.txt"
+    }
+}
+
+class FailingStorage(StorageSimulator):
+    """Storage whose downloads and copies always fail."""
+    
+    async def iter_chunks(self, *args, **kwargs):
+        raise Exception("Persistent failure")
+        yield  # Unreachable; makes this an async generator like the real method
+    
+    async def copy(self, *args, **kwargs):
+        raise Exception("Persistent failure")
+
+@pytest.fixture(scope="module")
+def sample_event():
+    """Create a sample transfer event shared by the module (treat as read-only)."""
+    return TransferEvent(
+        schema_version="1.0.0",
+        event_id=_mk_id(),
+        correlation_id=_mk_id(),
+        timestamp=FROZEN_TS,
+        source={
+            "provider": "aws_s3",
+            "bucket": "source-bucket",
+            "key": "test-file.txt"
+        },
+        destination={
+            "provider": "gcp_gcs",
+            "bucket": "dest-bucket",
+            "key": "output-file.txt"
+        },
+        metadata={
+            "contentType": "text/plain"
+        }
+    )
+
+@pytest.fixture(scope="module")
+def make_worker():
+    """Factory for TransferWorker instances backed by in-memory storage."""
+    def _make_worker(storage=None, **kwargs):
+        return TransferWorker(storage=storage or StorageSimulator(in_memory=True), **kwargs)
+    return _make_worker
+
+@pytest.fixture(scope="module")
+def mock_logger():
+    """Patch the module logger once per module; tests inspect its recorded calls."""
+    with patch('transfer_worker.logger', Mock(spec_set=logging.Logger)) as mock:
+        yield mock
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    """Replace asyncio.sleep with a no-op so retry tests skip real backoff delays."""
+    mock_sleep = AsyncMock()
+    monkeypatch.setattr("transfer_worker.asyncio.sleep", mock_sleep)
+    return mock_sleep
+
 class TestTransferEvent:
     """Tests for TransferEvent data model."""
     
@@ -29,9 +124,9 @@ class TestTransferEvent:
         """Test creating TransferEvent from valid JSON."""
         json_data = {
             "schemaVersion": "1.0.0",
-            "eventId": str(uuid.uuid4()),
-            "correlationId": str(uuid.uuid4()),
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "eventId": _mk_id(),
+            "correlationId": _mk_id(),
+            "timestamp": FROZEN_TS,
             "source": {
                 "provider": "aws_s3",
                 "bucket": "test-bucket",
@@ -60,7 +155,7 @@ class TestTransferEvent:
             schema_version="1.0.0",
             event_id="test-id",
             correlation_id="correlation-id",
-            timestamp="2024-01-01T00:00:00Z",
+            timestamp=FROZEN_TS,
             source={"provider": "aws_s3", "bucket": "test", "key": "file.txt"},
             destination={"provider": "gcp_gcs", "bucket": "dest", "key": "output.txt"}
         )
@@ -70,14 +165,22 @@ class TestTransferEvent:
         assert json_data["schemaVersion"] == "1.0.0"
         assert json_data["eventId"] == "test-id"
         assert json_data["source"]["provider"] == "aws_s3"
+    
+    def test_bytes_round_trip(self, sample_event):
+        """Test encoding to and decoding from a raw message body."""
+        raw = sample_event.to_bytes()
+        
+        assert isinstance(raw, bytes)
+        assert json.loads(raw) == sample_event.to_json()
+        assert TransferEvent.from_bytes(raw) == sample_event
+        assert TransferEvent.from_bytes(raw.decode()) == sample_event
 
 class TestStorageSimulator:
     """Tests for StorageSimulator."""
     
-    @pytest.mark.asyncio
-    async def test_upload_download(self, tmp_path):
+    async def test_upload_download(self):
         """Test upload and download operations."""
-        storage = StorageSimulator(str(tmp_path / "storage"))
+        storage = StorageSimulator(in_memory=True)
         test_data = b"test content"
         
         # Upload
@@ -88,20 +191,109 @@ class TestStorageSimulator:
         
         assert downloaded == test_data
     
-    @pytest.mark.asyncio
-    async def test_download_nonexistent_creates_dummy(self, tmp_path):
-        """Test downloading non-existent file creates dummy data."""
+    async def test_upload_download_filesystem(self, tmp_path):
+        """Test upload and download against the filesystem backend."""
+        storage = StorageSimulator(str(tmp_path / "storage"))
+        test_data = b"test content"
+        
+        await storage.upload("aws_s3", "test-bucket", "test-key", test_data)
+        downloaded = await storage.download("aws_s3", "test-bucket", "test-key")
+        
+        assert downloaded == test_data
+        assert (tmp_path / "storage" / "aws_s3" / "test-bucket" / "test-key").exists()
+    
+    async def test_streaming_round_trip(self, tmp_path):
+        """Test chunked download and streamed upload against the filesystem."""
+        storage = StorageSimulator(str(tmp_path / "storage"))
+        test_data = bytes(range(256)) * 10
+        await storage.upload("aws_s3", "src", "key", test_data)
+        
+        chunks = [c async for c in storage.iter_chunks("aws_s3", "src", "key", chunk_size=1000)]
+        assert [len(c) for c in chunks] == [1000, 1000, 560]
+        
+        async def stream():
+            for chunk in chunks:
+                yield chunk
+        
+        await storage.upload("gcp_gcs", "dest", "key", stream())
+        assert await storage.download("gcp_gcs", "dest", "key") == test_data
+    
+    async def test_copy_filesystem(self, tmp_path):
+        """Test server-side copy between locations on the filesystem backend."""
+        storage = StorageSimulator(str(tmp_path / "storage"))
+        await storage.upload("aws_s3", "src", "key", b"copy me")
+        
+        copied = await storage.copy(
+            {"provider": "aws_s3", "bucket": "src", "key": "key"},
+            {"provider": "gcp_gcs", "bucket": "dest", "key": "copied"}
+        )
+        
+        assert copied == len(b"copy me")
+        assert await storage.download("gcp_gcs", "dest", "copied") == b"copy me"
+    
+    async def test_writes_recreate_deleted_directories(self, tmp_path):
+        """Test writes recover when a cached directory is deleted underneath them."""
+        storage = StorageSimulator(str(tmp_path / "storage"))
+        source = {"provider": "aws_s3", "bucket": "src", "key": "key"}
+        destination = {"provider": "gcp_gcs", "bucket": "dest", "key": "copied"}
+        await storage.upload("aws_s3", "src", "key", b"first")
+        await storage.copy(source, destination)
+        
+        shutil.rmtree(tmp_path / "storage" / "aws_s3")
+        shutil.rmtree(tmp_path / "storage" / "gcp_gcs")
+        
+        await storage.upload("aws_s3", "src", "key", b"second")
+        assert await storage.download("aws_s3", "src", "key") == b"second"
+        await storage.copy(source, destination)
+        assert await storage.download("gcp_gcs", "dest", "copied") == b"second"
+    
+    async def test_cancel_during_open_leaves_no_part_file(self, tmp_path):
+        """Test cancelling an upload while its part file is being opened cleans it up."""
+        storage = StorageSimulator(str(tmp_path / "storage"))
+        opened = []
+        create_in_dir = transfer_worker._create_in_dir
+        
+        def slow_create(path, create):
+            time.sleep(0.2)
+            opened.append(create_in_dir(path, create))
+            return opened[-1]
+        
+        with patch("transfer_worker._create_in_dir", slow_create):
+            upload = asyncio.create_task(storage.upload("gcp_gcs", "dest", "key", b"data"))
+            # Past the simulated network delay, while the open is still running
+            await asyncio.sleep(0.15)
+            upload.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await upload
+        
+        assert opened and opened[0].closed
+        assert list((tmp_path / "storage" / "gcp_gcs" / "dest").iterdir()) == []
+    
+    async def test_failed_stream_leaves_no_object(self, tmp_path):
+        """Test an upload whose stream fails midway does not commit a partial object."""
         storage = StorageSimulator(str(tmp_path / "storage"))
         
+        async def broken_stream():
+            yield b"partial"
+            raise ValueError("stream broke")
+        
+        with pytest.raises(ValueError, match="stream broke"):
+            await storage.upload("gcp_gcs", "dest", "key", broken_stream())
+        
+        assert list((tmp_path / "storage" / "gcp_gcs" / "dest").iterdir()) == []
+    
+    async def test_download_nonexistent_creates_dummy(self):
+        """Test downloading non-existent file creates dummy data."""
+        storage = StorageSimulator(in_memory=True)
+        
         # Download non-existent
         data = await storage.download("aws_s3", "new-bucket", "new-key")
         
         assert b"Simulated content" in data
     
-    @pytest.mark.asyncio
-    async def test_failure_injection(self, tmp_path):
+    async def test_failure_injection(self):
         """Test failure injection for testing."""
-        storage = StorageSimulator(str(tmp_path / "storage"))
+        storage = StorageSimulator(in_memory=True)
         storage.enable_failure_injection()
         
         # First two attempts should fail
@@ -117,50 +309,21 @@ class TestStorageSimulator:
 class TestTransferWorker:
     """Tests for TransferWorker."""
     
-    @pytest.fixture
-    def sample_event(self):
-        """Create a sample transfer event."""
-        return TransferEvent(
-            schema_version="1.0.0",
-            event_id=str(uuid.uuid4()),
-            correlation_id=str(uuid.uuid4()),
-            timestamp=datetime.now(timezone.utc).isoformat(),
-            source={
-                "provider": "aws_s3",
-                "bucket": "source-bucket",
-                "key": "test-file.txt"
-            },
-            destination={
-                "provider": "gcp_gcs",
-                "bucket": "dest-bucket",
-                "key": "output-file.txt"
-            },
-            metadata={
-                "contentType": "text/plain"
-            }
-        )
-    
-    @pytest.mark.asyncio
-    async def test_successful_transfer(self, sample_event, tmp_path):
+    async def test_successful_transfer(self, sample_event, make_worker):
         """Test successful file transfer (happy path)."""
-        worker = TransferWorker(
-            storage=StorageSimulator(str(tmp_path / "storage"))
-        )
+        worker = make_worker()
         
         # Process event
         result = await worker.process_event(sample_event)
         
         assert result is True
-        assert worker.metrics.metrics["transfer_success_total"] == 1
-        assert worker.metrics.metrics["transfer_failure_total"] == 0
+        assert worker.metrics.transfer_success_total == 1
+        assert worker.metrics.transfer_failure_total == 0
         assert sample_event.event_id in worker.processed_events
     
-    @pytest.mark.asyncio
-    async def test_idempotency(self, sample_event, tmp_path):
+    async def test_idempotency(self, sample_event, make_worker):
         """Test idempotent event processing."""
-        worker = TransferWorker(
-            storage=StorageSimulator(str(tmp_path / "storage"))
-        )
+        worker = make_worker()
         
         # Process event twice
         result1 = await worker.process_event(sample_event)
@@ -169,40 +332,85 @@ class TestTransferWorker:
         assert result1 is True
         assert result2 is True
         # Should only count as one success
-        assert worker.metrics.metrics["transfer_success_total"] == 1
+        assert worker.metrics.transfer_success_total == 1
     
-    @pytest.mark.asyncio
-    async def test_retry_with_eventual_success(self, sample_event, tmp_path):
+    async def test_processed_events_bounded(self, sample_event, make_worker):
+        """Test idempotency cache forgets the oldest generation of event IDs."""
+        worker = make_worker(max_processed_events=2)
+        
+        for i in range(4):
+            await worker.process_event(replace(sample_event, event_id=f"event-{i}"))
+        
+        assert "event-0" not in worker.processed_events
+        assert "event-1" not in worker.processed_events
+        assert "event-2" in worker.processed_events
+        assert "event-3" in worker.processed_events
+    
+    def test_idempotency_cache_uuid_keys(self):
+        """Test UUID event IDs are matched regardless of string formatting."""
+        cache = IdempotencyCache()
+        event_id = uuid.uuid4()
+        
+        cache.add(str(event_id))
+        
+        assert event_id.hex in cache
+        assert str(event_id).upper() in cache
+        assert len(cache) == 1
+    
+    async def test_concurrent_duplicate_uuid_spellings(self, sample_event, make_worker):
+        """Test concurrent deliveries of one UUID in different spellings transfer once."""
+        worker = make_worker()
+        event_id = uuid.uuid4()
+        
+        results = await asyncio.gather(
+            worker.process_event(replace(sample_event, event_id=str(event_id))),
+            worker.process_event(replace(sample_event, event_id=event_id.hex))
+        )
+        
+        assert results == [True, True]
+        assert worker.metrics.transfer_success_total == 1
+    
+    async def test_duplicate_survives_cancelled_first_delivery(self, sample_event, make_worker):
+        """Test a waiting duplicate transfers the event itself if the first is cancelled."""
+        worker = make_worker()
+        event = replace(sample_event, event_id=_mk_id())
+        
+        first = asyncio.create_task(worker.process_event(event))
+        duplicate = asyncio.create_task(worker.process_event(event))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert await duplicate is True
+        assert worker.metrics.transfer_success_total == 1
+        assert event.event_id in worker.processed_events
+    
+    async def test_retry_with_eventual_success(self, sample_event, make_worker, no_sleep):
         """Test retry mechanism with eventual success."""
-        storage = StorageSimulator(str(tmp_path / "storage"))
+        storage = StorageSimulator(in_memory=True)
         storage.enable_failure_injection()
         
-        worker = TransferWorker(
+        worker = make_worker(
             storage=storage,
-            retry_config=RetryConfig(max_attempts=3, initial_delay_ms=10)
+            retry_config=RetryConfig(max_attempts=3, initial_delay_ms=10, jitter=0.0)
         )
         
         # Should succeed on third attempt
         result = await worker.process_event(sample_event)
         
         assert result is True
-        assert worker.metrics.metrics["retry_count"] == 2  # 2 retries after first failure
-        assert worker.metrics.metrics["transfer_success_total"] == 1
+        assert worker.metrics.retry_count == 2  # 2 retries after first failure
+        assert worker.metrics.transfer_success_total == 1
+        # Exponential backoff between attempts: 10ms, then 20ms
+        no_sleep.assert_any_await(0.01)
+        no_sleep.assert_any_await(0.02)
     
-    @pytest.mark.asyncio
-    async def test_max_retries_exceeded_dlq(self, sample_event, tmp_path):
+    async def test_max_retries_exceeded_dlq(self, sample_event, make_worker, no_sleep):
         """Test DLQ when max retries exceeded."""
-        storage = StorageSimulator(str(tmp_path / "storage"))
-        
-        # Mock storage to always fail
-        async def always_fail(*args, **kwargs):
-            raise Exception("Persistent failure")
-        
-        storage.download = always_fail
-        
-        worker = TransferWorker(
-            storage=storage,
-            retry_config=RetryConfig(max_attempts=2, initial_delay_ms=10),
+        worker = make_worker(
+            storage=FailingStorage(in_memory=True),
+            retry_config=RetryConfig(max_attempts=2, initial_delay_ms=10, jitter=0.0),
             enable_dlq=True
         )
         
@@ -210,51 +418,130 @@ class TestTransferWorker:
         result = await worker.process_event(sample_event)
         
         assert result is False
-        assert worker.metrics.metrics["transfer_failure_total"] == 1
+        assert worker.metrics.transfer_failure_total == 1
         assert len(worker.dlq) == 1
         assert worker.dlq[0]["event"]["eventId"] == sample_event.event_id
+        assert worker.dlq[0]["attempts"] == 2
+        # Single backoff between the two attempts
+        assert no_sleep.await_args_list.count(call(0.01)) == 1
+    
+    async def test_dlq_bounded(self, sample_event, make_worker, no_sleep):
+        """Test DLQ keeps only the newest entries but counts every failure."""
+        worker = make_worker(
+            storage=FailingStorage(in_memory=True),
+            retry_config=RetryConfig(max_attempts=1),
+            dlq_max_size=2
+        )
+        
+        for i in range(3):
+            await worker.process_event(replace(sample_event, event_id=f"event-{i}"))
+        
+        assert [entry["event"]["eventId"] for entry in worker.dlq] == ["event-1", "event-2"]
+        assert worker.dlq_total == 3
+        health = worker.get_health_status()
+        assert health["dlq_size"] == 2
+        assert health["dlq_total"] == 3
     
-    @pytest.mark.asyncio
-    async def test_checksum_validation(self, tmp_path):
+    @pytest.mark.parametrize("checksum,expected", [
+        ("invalid_checksum", False),
+        (None, True),
+        (SAMPLE_CHECKSUM, True)
+    ])
+    async def test_checksum_validation(
+        self, sample_event, make_worker, no_sleep, checksum, expected
+    ):
         """Test checksum validation during transfer."""
-        storage = StorageSimulator(str(tmp_path / "storage"))
-        worker = TransferWorker(storage=storage)
+        worker = make_worker()
         
-        # Create event with checksum
-        event = TransferEvent(
-            schema_version="1.0.0",
-            event_id=str(uuid.uuid4()),
-            correlation_id=str(uuid.uuid4()),
-            timestamp=datetime.now(timezone.utc).isoformat(),
-            source={
-                "provider": "aws_s3",
-                "bucket": "source-bucket",
-                "key": "test-file.txt"
-            },
-            destination={
-                "provider": "gcp_gcs",
-                "bucket": "dest-bucket",
-                "key": "output-file.txt"
-            },
-            metadata={
-                "checksumSHA256": "invalid_checksum"
-            }
-        )
+        # Derive an event with the given checksum from the shared sample
+        event = replace(sample_event, metadata={"checksumSHA256": checksum} if checksum else {})
         
-        # Should fail due to checksum mismatch
+        # Mismatched checksums must fail the transfer
         result = await worker.process_event(event)
         
+        assert result is expected
+        assert worker.metrics.transfer_failure_total == (0 if expected else 1)
+        # Mismatches are unrecoverable, so they go to the DLQ without retrying
+        assert worker.metrics.retry_count == 0
+        assert len(worker.dlq) == (0 if expected else 1)
+    
+    async def test_blake3_checksum_validation(self, sample_event, make_worker, no_sleep):
+        """Test BLAKE3 checksums are verified when the blake3 package is installed."""
+        blake3 = pytest.importorskip("blake3")
+        worker = make_worker()
+        
+        content = f"Simulated content for {sample_event.source['key']}".encode()
+        checksum = blake3.blake3(content).hexdigest()
+        event = replace(sample_event, metadata={"checksumBLAKE3": checksum})
+        
+        assert await worker.process_event(event) is True
+    
+    @pytest.mark.parametrize("matches", [True, False])
+    async def test_blake3_checksum_dispatch(self, sample_event, make_worker, no_sleep, matches):
+        """Test the BLAKE3 path verifies streamed chunks, using a stand-in hasher."""
+        storage = StorageSimulator(in_memory=True)
+        # Large enough that chunks are hashed in a worker thread
+        payload = bytes(range(256)) * (3 * CHUNK_SIZE // 256) + b"tail"
+        await storage.upload("aws_s3", "source-bucket", "test-file.txt", payload)
+        worker = make_worker(storage=storage)
+        
+        checksum = hashlib.sha256(payload).hexdigest() if matches else "0" * 64
+        event = replace(sample_event, metadata={"checksumBLAKE3": checksum})
+        stand_in = Mock(side_effect=hashlib.sha256)
+        with patch("transfer_worker.blake3", stand_in):
+            result = await worker.process_event(event)
+        
+        stand_in.assert_called_once_with()
+        assert result is matches
+        assert len(worker.dlq) == (0 if matches else 1)
+    
+    async def test_blake3_checksum_without_package(self, sample_event, make_worker, no_sleep):
+        """Test BLAKE3 checksums fail permanently when blake3 is not installed."""
+        worker = make_worker()
+        event = replace(sample_event, metadata={"checksumBLAKE3": "0" * 64})
+        
+        with patch("transfer_worker.blake3", None):
+            result = await worker.process_event(event)
+        
         assert result is False
-        assert worker.metrics.metrics["transfer_failure_total"] == 1
+        assert worker.metrics.retry_count == 0
+        assert "blake3" in worker.dlq[0]["error"]
+    
+    async def test_blake3_falls_back_to_sha256(self, sample_event, make_worker, no_sleep):
+        """Test events with both checksums are verified with SHA-256 when blake3 is missing."""
+        worker = make_worker()
+        metadata = {"checksumBLAKE3": "0" * 64, "checksumSHA256": SAMPLE_CHECKSUM}
+        event = replace(sample_event, metadata=metadata)
+        
+        with patch("transfer_worker.blake3", None):
+            result = await worker.process_event(event)
+        
+        assert result is True
+        assert len(worker.dlq) == 0
+    
+    async def test_pipelined_transfer_multi_chunk(self, sample_event, make_worker, no_sleep):
+        """Test an object larger than the pipeline buffer streams through intact."""
+        storage = StorageSimulator(in_memory=True)
+        payload = bytes(range(256)) * ((PIPELINE_DEPTH + 2) * CHUNK_SIZE // 256) + b"tail"
+        await storage.upload("aws_s3", "source-bucket", "test-file.txt", payload)
+        worker = make_worker(storage=storage)
+        
+        checksum = hashlib.sha256(payload).hexdigest()
+        event = replace(sample_event, metadata={"checksumSHA256": checksum})
+        result = await worker.process_event(event)
+        
+        assert result is True
+        assert await storage.download("gcp_gcs", "dest-bucket", "output-file.txt") == payload
+        assert worker.metrics.get_metrics()["total_bytes_transferred"] == len(payload)
     
-    @pytest.mark.asyncio
     async def test_exponential_backoff(self):
         """Test exponential backoff calculation."""
         worker = TransferWorker(
             retry_config=RetryConfig(
                 initial_delay_ms=100,
                 max_delay_ms=10000,
-                multiplier=2
+                multiplier=2,
+                jitter=0.0
             )
         )
         
@@ -267,6 +554,30 @@ class TestTransferWorker:
         # Should cap at max_delay
         assert worker._calculate_backoff_delay(10) == 10000
     
+    def test_backoff_jitter(self):
+        """Test jittered backoff stays within bounds and varies between calls."""
+        worker = TransferWorker(
+            retry_config=RetryConfig(initial_delay_ms=1000, max_delay_ms=1200, jitter=0.5)
+        )
+        
+        delays = [worker._calculate_backoff_delay(1) for _ in range(100)]
+        
+        assert all(500 <= d <= 1000 for d in delays)
+        assert len(set(delays)) > 1
+    
+    def test_backoff_jitter_at_cap(self):
+        """Test delays that reach max_delay_ms are still spread out."""
+        worker = TransferWorker(
+            retry_config=RetryConfig(initial_delay_ms=1000, max_delay_ms=1200, jitter=0.5)
+        )
+        
+        # Attempt 5 would be 16s uncapped
+        delays = [worker._calculate_backoff_delay(5) for _ in range(100)]
+        
+        assert all(600 <= d <= 1200 for d in delays)
+        assert delays.count(1200) <= 5
+        assert len(set(delays)) > 50
+    
     def test_health_status(self):
         """Test health status reporting."""
         worker = TransferWorker()
@@ -275,6 +586,7 @@ class TestTransferWorker:
         health = worker.get_health_status()
         assert health["status"] == "healthy"
         assert health["dlq_size"] == 0
+        assert health["dlq_total"] == 0
         
         # Add failures to degrade health
         for _ in range(10):
@@ -294,7 +606,6 @@ class TestTransferWorker:
 class TestQueueSimulator:
     """Tests for QueueSimulator."""
     
-    @pytest.mark.asyncio
     async def test_send_receive_message(self):
         """Test sending and receiving messages."""
         queue = QueueSimulator()
@@ -302,7 +613,7 @@ class TestQueueSimulator:
             schema_version="1.0.0",
             event_id="test-id",
             correlation_id="corr-id",
-            timestamp="2024-01-01T00:00:00Z",
+            timestamp=FROZEN_TS,
             source={"provider": "aws_s3", "bucket": "test", "key": "file"},
             destination={"provider": "gcp_gcs", "bucket": "dest", "key": "out"}
         )
@@ -313,10 +624,10 @@ class TestQueueSimulator:
         
         # Receive message
         received = await queue.receive_message()
-        assert received == event
+        assert received == event.to_bytes()
+        assert TransferEvent.from_bytes(received) == event
         assert queue.get_queue_size() == 0
     
-    @pytest.mark.asyncio
     async def test_receive_timeout(self):
         """Test receive timeout."""
         queue = QueueSimulator()
@@ -324,6 +635,27 @@ class TestQueueSimulator:
         # Should timeout and return None
         received = await queue.receive_message(timeout=0.1)
         assert received is None
+    
+    async def test_receive_zero_timeout(self, sample_event):
+        """Test zero timeout polls without blocking."""
+        queue = QueueSimulator()
+        
+        # Empty queue returns immediately instead of waiting forever
+        assert await queue.receive_message(timeout=0) is None
+        
+        await queue.send_message(sample_event)
+        assert await queue.receive_message(timeout=0) == sample_event.to_bytes()
+    
+    async def test_receive_batch(self, sample_event):
+        """Test batch receive takes only what is queued, up to n messages."""
+        queue = QueueSimulator()
+        events = [replace(sample_event, event_id=f"event-{i}") for i in range(3)]
+        for event in events:
+            await queue.send_message(event)
+        
+        assert await queue.receive_batch(2) == [e.to_bytes() for e in events[:2]]
+        assert await queue.receive_batch(2) == [e.to_bytes() for e in events[2:]]
+        assert await queue.receive_batch(2, timeout=0) == []
 
 class TestMetricsCollector:
     """Tests for MetricsCollector."""
@@ -344,106 +676,227 @@ class TestMetricsCollector:
         metrics.record_retry()
         
         # Check metrics
-        snapshot = metrics.get_metrics()
-        assert snapshot["transfer_success_total"] == 2
-        assert snapshot["transfer_failure_total"] == 1
-        assert snapshot["retry_count"] == 2
-        assert snapshot["avg_duration_seconds"] == 1.75
-        assert snapshot["total_bytes_transferred"] == 3000
-        assert abs(snapshot["transfer_success_rate"] - 66.67) < 0.1
+        assert metrics.get_metrics() == pytest.approx({
+            "transfer_success_total": 2,
+            "transfer_failure_total": 1,
+            "transfer_success_rate": 200 / 3,
+            "retry_count": 2,
+            "avg_duration_seconds": 1.75,
+            "total_bytes_transferred": 3000
+        })
     
     def test_success_rate_calculation(self):
         """Test success rate calculation edge cases."""
         metrics = MetricsCollector()
         
         # No transfers yet - should be 100%
-        snapshot = metrics.get_metrics()
-        assert snapshot["transfer_success_rate"] == 100.0
+        assert metrics.get_metrics() == {
+            "transfer_success_total": 0,
+            "transfer_failure_total": 0,
+            "transfer_success_rate": 100.0,
+            "retry_count": 0,
+            "avg_duration_seconds": 0.0,
+            "total_bytes_transferred": 0
+        }
         
         # All successful
         metrics.record_success(1.0, 100)
         metrics.record_success(1.0, 100)
-        snapshot = metrics.get_metrics()
-        assert snapshot["transfer_success_rate"] == 100.0
+        assert metrics.get_metrics() == {
+            "transfer_success_total": 2,
+            "transfer_failure_total": 0,
+            "transfer_success_rate": 100.0,
+            "retry_count": 0,
+            "avg_duration_seconds": 1.0,
+            "total_bytes_transferred": 200
+        }
         
         # All failed
         metrics2 = MetricsCollector()
         metrics2.record_failure()
         metrics2.record_failure()
-        snapshot2 = metrics2.get_metrics()
-        assert snapshot2["transfer_success_rate"] == 0.0
+        assert metrics2.get_metrics() == {
+            "transfer_success_total": 0,
+            "transfer_failure_total": 2,
+            "transfer_success_rate": 0.0,
+            "retry_count": 0,
+            "avg_duration_seconds": 0.0,
+            "total_bytes_transferred": 0
+        }
 
 class TestStructuredLogger:
     """Tests for StructuredLogger."""
     
-    def test_log_formatting(self):
+    @pytest.fixture(autouse=True)
+    def _reset_mock_logger(self, mock_logger):
+        mock_logger.reset_mock(return_value=True, side_effect=True)
+    
+    def test_log_formatting(self, mock_logger):
         """Test structured log formatting."""
         logger = StructuredLogger("test-service")
         logger.set_context("corr-123", "event-456")
         
-        # Mock the underlying logger
-        with patch('transfer_worker.logger') as mock_logger:
-            logger.info("Test message", extra_field="value")
-            
-            # Check that JSON was logged
-            call_args = mock_logger.info.call_args[0][0]
-            log_data = json.loads(call_args)
-            
-            assert log_data["level"] == "INFO"
-            assert log_data["service"] == "test-service"
-            assert log_data["message"] == "Test message"
-            assert log_data["correlation_id"] == "corr-123"
-            assert log_data["event_id"] == "event-456"
-            assert log_data["extra_field"] == "value"
-            assert "timestamp" in log_data
+        logger.info("Test message", extra_field="value")
+        
+        # Check that JSON was logged
+        call_args = mock_logger.info.call_args[0][0]
+        log_data = json.loads(call_args)
+        
+        assert LOG_REQUIRED_FIELDS <= log_data.keys()
+        assert log_data.pop("timestamp")
+        assert log_data == {
+            "level": "INFO",
+            "service": "test-service",
+            "message": "Test message",
+            "correlation_id": "corr-123",
+            "event_id": "event-456",
+            "extra_field": "value"
+        }
+    
+    def test_log_kwargs_override_context(self, mock_logger):
+        """Test explicit kwargs take precedence over pre-serialized context fields."""
+        logger = StructuredLogger("test-service")
+        logger.set_context("corr-123", "event-456")
+        
+        logger.info("Test message", event_id="event-789")
+        
+        call_args = mock_logger.info.call_args[0][0]
+        log_data = json.loads(call_args)
+        
+        assert LOG_REQUIRED_FIELDS <= log_data.keys()
+        assert log_data["event_id"] == "event-789"
+        assert log_data["correlation_id"] == "corr-123"
+        assert call_args.count('"event_id"') == 1
+    
+    @pytest.mark.parametrize("method,level", [
+        ("debug", logging.DEBUG),
+        ("info", logging.INFO),
+        ("warning", logging.WARNING),
+        ("error", logging.ERROR)
+    ])
+    def test_skipped_when_level_disabled(self, mock_logger, method, level):
+        """Test lines are not formatted when their level is disabled."""
+        logger = StructuredLogger("test-service")
+        mock_logger.isEnabledFor.return_value = False
+        
+        with patch.object(logger, "_format_message") as format_message:
+            getattr(logger, method)("Not emitted")
+        
+        mock_logger.isEnabledFor.assert_called_once_with(level)
+        format_message.assert_not_called()
+        getattr(mock_logger, method).assert_not_called()
+    
+    def test_json_fallback_for_non_str_keys(self, mock_logger):
+        """Test values orjson rejects still serialize via the stdlib encoder."""
+        logger = StructuredLogger("test-service")
+        
+        logger.info("Test message", counts={1: "one"})
+        
+        log_data = json.loads(mock_logger.info.call_args[0][0])
+        assert log_data["counts"] == {"1": "one"}
+    
+    async def test_context_is_task_local(self):
+        """Test concurrent tasks keep their own logging context."""
+        logger = StructuredLogger("test-service")
+        
+        async def log_for(event_id):
+            logger.set_context(f"corr-{event_id}", event_id)
+            await asyncio.sleep(0)
+            return logger.correlation_id, logger.event_id
+        
+        results = await asyncio.gather(log_for("a"), log_for("b"))
+        
+        assert results == [("corr-a", "a"), ("corr-b", "b")]
 
 # Integration test
 class TestIntegration:
     """Integration tests for the complete system."""
     
-    @pytest.mark.asyncio
-    async def test_end_to_end_transfer(self, tmp_path):
+    async def test_end_to_end_transfer(self, make_worker):
         """Test complete end-to-end transfer workflow."""
         # Setup
-        storage = StorageSimulator(str(tmp_path / "storage"))
-        worker = TransferWorker(storage=storage)
+        worker = make_worker()
         queue = QueueSimulator()
         
         # Create and queue multiple events
         events = []
         for i in range(3):
-            event = TransferEvent(
-                schema_version="1.0.0",
-                event_id=f"event-{i}",
-                correlation_id=f"corr-{i}",
-                timestamp=datetime.now(timezone.utc).isoformat(),
-                source={
-                    "provider": "aws_s3",
-                    "bucket": "source-bucket",
-                    "key": f"file-{i}.txt"
-                },
-                destination={
-                    "provider": "gcp_gcs",
-                    "bucket": "dest-bucket",
-                    "key": f"output-{i}.txt"
-                }
-            )
+            event = TransferEvent.from_json({
+                **BASE_EVENT,
+                "eventId": f"event-{i}",
+                "correlationId": f"corr-{i}",
+                "source": {**BASE_EVENT["source"], "key": f"file-{i}.txt"},
+                "destination": {**BASE_EVENT["destination"], "key": f"output-{i}.txt"}
+            })
             events.append(event)
             await queue.send_message(event)
+        # Redelivery of an event that is processed concurrently with the original
+        await queue.send_message(events[0])
         
-        # Process all events
-        results = []
+        # Drain the queue and process all events concurrently
+        pending = []
         while queue.get_queue_size() > 0:
-            event = await queue.receive_message()
-            if event:
-                result = await worker.process_event(event)
-                results.append(result)
+            pending.append(TransferEvent.from_bytes(await queue.receive_message()))
+        results = await asyncio.gather(
+            *(worker.process_event(event) for event in pending)
+        )
         
-        # Verify all succeeded
+        # Verify all succeeded, with the duplicate transferred only once
+        assert len(results) == 4
         assert all(results)
-        assert worker.metrics.metrics["transfer_success_total"] == 3
-        assert worker.metrics.metrics["transfer_failure_total"] == 0
+        assert worker.metrics.transfer_success_total == 3
+        assert worker.metrics.transfer_failure_total == 0
         assert len(worker.processed_events) == 3
+    
+    async def test_run_drains_queue_in_batches(self, make_worker):
+        """Test the worker loop processes queued events until the queue is idle."""
+        worker = make_worker(max_concurrency=2)
+        queue = QueueSimulator()
+        
+        for i in range(5):
+            await queue.send_message(TransferEvent.from_json({
+                **BASE_EVENT,
+                "eventId": f"event-{i}",
+                "source": {**BASE_EVENT["source"], "key": f"file-{i}.txt"}
+            }))
+        
+        processed = await worker.run(queue, timeout=0.1)
+        
+        assert processed == 5
+        assert queue.get_queue_size() == 0
+        assert worker.metrics.transfer_success_total == 5
+    
+    async def test_run_deduplicates_redelivered_event(self, sample_event, make_worker):
+        """Test two copies of one event in the same batch transfer only once."""
+        storage = StorageSimulator(in_memory=True)
+        worker = make_worker(storage=storage)
+        queue = QueueSimulator()
+        
+        await queue.send_message(sample_event)
+        await queue.send_message(sample_event)
+        
+        with patch.object(storage, "copy", wraps=storage.copy) as copy:
+            processed = await worker.run(queue, timeout=0.1)
+        
+        assert processed == 2
+        assert copy.await_count == 1
+        assert worker.metrics.transfer_success_total == 1
+        assert sample_event.event_id in worker.processed_events
+    
+    async def test_run_discards_undecodable_messages(self, sample_event, make_worker):
+        """Test malformed message bodies are dropped without stopping the batch."""
+        worker = make_worker()
+        queue = QueueSimulator()
+        
+        await queue.send_message(b"not json")
+        await queue.send_message(b'{"eventId": "missing-fields"}')
+        await queue.send_message(sample_event)
+        
+        processed = await worker.run(queue, timeout=0.1)
+        
+        assert processed == 3
+        assert worker.metrics.transfer_success_total == 1
+        assert worker.metrics.transfer_failure_total == 0
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -5,18 +5,40 @@ idempotency, and comprehensive observability.
 """
 
 import asyncio
+import collections
+import contextlib
+import contextvars
+import functools
 import hashlib
 import json
 import logging
 import os
+import random
+import shutil
 import time
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, Optional, Set
-from contextlib import asynccontextmanager
+from typing import (
+    Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
+)
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; fall back to the stdlib encoder
+    orjson = None  # type: ignore[assignment]
+
+try:
+    from blake3 import blake3
+except ImportError:  # Optional; events carrying checksumBLAKE3 fail without it
+    blake3 = None  # type: ignore[misc, assignment]
+
+try:
+    import uvloop
+except ImportError:  # Optional faster event loop; not available on Windows
+    uvloop = None  # type: ignore[assignment]
 
 # Configure structured logging
 logging.basicConfig(
@@ -26,6 +48,87 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Chunk size for streaming transfers; bounds per-transfer memory
+CHUNK_SIZE = 1024 * 1024
+
+# Chunks buffered between download and upload of a single transfer
+PIPELINE_DEPTH = 8
+
+# Chunks at least this large are hashed in a worker thread; hashlib releases
+# the GIL for large buffers, so hashing overlaps with the upload
+HASH_OFFLOAD_MIN_BYTES = 64 * 1024
+
+def _json_dumpb(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # orjson rejects some inputs json accepts (e.g. non-str dict keys)
+            pass
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize to a compact JSON string."""
+    return _json_dumpb(obj).decode()
+
+def _json_loads(raw: Union[bytes, str]) -> Any:
+    """Parse JSON straight from bytes or str, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+# Last formatted timestamp, reused for calls within the same millisecond
+_timestamp_cache: Dict[str, Any] = {"time": 0.0, "iso": ""}
+
+def _utc_now_iso() -> str:
+    """Current UTC time in ISO 8601 format, reformatted at most once per millisecond."""
+    now = time.time()
+    if not 0 <= now - _timestamp_cache["time"] < 0.001:
+        _timestamp_cache["time"] = now
+        _timestamp_cache["iso"] = datetime.fromtimestamp(now, timezone.utc).isoformat()
+    return _timestamp_cache["iso"]
+
+@functools.lru_cache(maxsize=4096)
+def _ensure_dir(directory: str):
+    """Create a directory and its parents once per process; repeat calls are cache hits."""
+    os.makedirs(directory, exist_ok=True)
+
+def _create_in_dir(path: str, create: Callable[[str], Any]) -> Any:
+    """
+    Call create(path) after making sure the parent directory exists.
+    
+    A directory deleted after it was cached makes create fail with
+    FileNotFoundError; the cache is then cleared and the directory
+    recreated before one retry.
+    """
+    directory = os.path.dirname(path)
+    _ensure_dir(directory)
+    try:
+        return create(path)
+    except FileNotFoundError:
+        _ensure_dir.cache_clear()
+        _ensure_dir(directory)
+        return create(path)
+
+def _remove_if_exists(path: str):
+    """Delete a file, ignoring it if it was never created."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+def _commit_part(f, part_path: str, path: str):
+    """Close a fully written part file and move it into place."""
+    f.close()
+    os.replace(part_path, path)
+
+def _discard_part(f, part_path: str):
+    """Close (if it was opened) and delete an abandoned part file."""
+    if f is not None:
+        f.close()
+    _remove_if_exists(part_path)
+
 class CloudProvider(Enum):
     """Supported cloud storage providers."""
     AWS_S3 = "aws_s3"
@@ -40,6 +143,9 @@ class TransferStatus(Enum):
     RETRYING = "retrying"
     DLQ = "dead_letter_queue"
 
+class UnrecoverableTransferError(Exception):
+    """Transfer failure that retrying cannot fix (e.g. checksum mismatch)."""
+
 @dataclass
 class RetryConfig:
     """Retry configuration for transfer operations."""
@@ -47,8 +153,9 @@ class RetryConfig:
     initial_delay_ms: int = 1000
     max_delay_ms: int = 30000
     multiplier: int = 2
+    jitter: float = 0.5  # Fraction of the delay that may be randomly taken off
 
-@dataclass
+@dataclass(slots=True)
 class TransferEvent:
     """Transfer event data model."""
     schema_version: str
@@ -72,6 +179,11 @@ class TransferEvent:
             metadata=data.get("metadata", {})
         )
     
+    @classmethod
+    def from_bytes(cls, raw: Union[bytes, str]) -> "TransferEvent":
+        """Create TransferEvent from a raw queue message body."""
+        return cls.from_json(_json_loads(raw))
+    
     def to_json(self) -> Dict[str, Any]:
         """Convert to JSON-serializable dictionary."""
         return {
@@ -83,24 +195,60 @@ class TransferEvent:
             "destination": self.destination,
             "metadata": self.metadata
         }
+    
+    def to_bytes(self) -> bytes:
+        """Encode as a compact JSON message body."""
+        return _json_dumpb(self.to_json())
 
 class StructuredLogger:
     """Structured JSON logger with correlation tracking."""
     
+    # Fields serialized once per context rather than on every log line
+    CONTEXT_FIELDS = frozenset({"service", "correlation_id", "event_id"})
+    
     def __init__(self, service_name: str = "transfer-worker"):
         self.service_name = service_name
-        self.correlation_id: Optional[str] = None
-        self.event_id: Optional[str] = None
+        # Context is task-local so concurrently processed events keep their own IDs
+        self._context: contextvars.ContextVar = contextvars.ContextVar(
+            f"{service_name}-log-context", default=self._build_context(None, None)
+        )
+    
+    @property
+    def correlation_id(self) -> Optional[str]:
+        return self._context.get()[0]
+    
+    @property
+    def event_id(self) -> Optional[str]:
+        return self._context.get()[1]
     
     def set_context(self, correlation_id: str, event_id: str):
         """Set logging context for current operation."""
-        self.correlation_id = correlation_id
-        self.event_id = event_id
+        self._context.set(self._build_context(correlation_id, event_id))
+    
+    def _build_context(self, correlation_id: Optional[str], event_id: Optional[str]) -> tuple:
+        """Build context tuple with the static JSON fields pre-serialized."""
+        static_json = _json_dumps({
+            "service": self.service_name,
+            "correlation_id": correlation_id,
+            "event_id": event_id
+        })
+        # Strip braces so the fields can be spliced into each log line
+        return correlation_id, event_id, static_json[1:-1]
     
     def _format_message(self, level: str, message: str, **kwargs) -> str:
         """Format log message as structured JSON."""
+        if self.CONTEXT_FIELDS.isdisjoint(kwargs):
+            line = _json_dumps({
+                "timestamp": _utc_now_iso(),
+                "level": level,
+                "message": message,
+                **kwargs
+            })
+            return f"{line[:-1]},{self._context.get()[2]}}}"
+        
+        # Caller overrides a context field; serialize the full entry
         log_entry = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": _utc_now_iso(),
             "level": level,
             "service": self.service_name,
             "message": message,
@@ -108,126 +256,302 @@ class StructuredLogger:
             "event_id": self.event_id,
             **kwargs
         }
-        return json.dumps(log_entry)
+        return _json_dumps(log_entry)
     
+    # Each level is checked before formatting so disabled lines cost no serialization
     def info(self, message: str, **kwargs):
-        logger.info(self._format_message("INFO", message, **kwargs))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(self._format_message("INFO", message, **kwargs))
     
     def error(self, message: str, **kwargs):
-        logger.error(self._format_message("ERROR", message, **kwargs))
+        if logger.isEnabledFor(logging.ERROR):
+            logger.error(self._format_message("ERROR", message, **kwargs))
     
     def warning(self, message: str, **kwargs):
-        logger.warning(self._format_message("WARNING", message, **kwargs))
+        if logger.isEnabledFor(logging.WARNING):
+            logger.warning(self._format_message("WARNING", message, **kwargs))
     
     def debug(self, message: str, **kwargs):
-        logger.debug(self._format_message("DEBUG", message, **kwargs))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(self._format_message("DEBUG", message, **kwargs))
 
 class MetricsCollector:
     """Simple metrics collector for monitoring."""
     
+    # Counters are slotted attributes: cheaper to increment than dict entries
+    __slots__ = (
+        "transfer_success_total",
+        "transfer_failure_total",
+        "retry_count",
+        "_duration_sum",
+        "_bytes_sum"
+    )
+    
     def __init__(self):
-        self.metrics = {
-            "transfer_success_total": 0,
-            "transfer_failure_total": 0,
-            "transfer_duration_seconds": [],
-            "transfer_bytes": [],
-            "retry_count": 0
-        }
+        self.transfer_success_total = 0
+        self.transfer_failure_total = 0
+        self.retry_count = 0
+        # Running totals instead of per-transfer history: O(1) memory and snapshots
+        self._duration_sum = 0.0
+        self._bytes_sum = 0
     
     def record_success(self, duration: float, bytes_transferred: int):
         """Record successful transfer metrics."""
-        self.metrics["transfer_success_total"] += 1
-        self.metrics["transfer_duration_seconds"].append(duration)
-        self.metrics["transfer_bytes"].append(bytes_transferred)
+        self.transfer_success_total += 1
+        self._duration_sum += duration
+        self._bytes_sum += bytes_transferred
     
     def record_failure(self):
         """Record failed transfer."""
-        self.metrics["transfer_failure_total"] += 1
+        self.transfer_failure_total += 1
     
     def record_retry(self):
         """Record retry attempt."""
-        self.metrics["retry_count"] += 1
+        self.retry_count += 1
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get current metrics snapshot."""
         return {
-            "transfer_success_total": self.metrics["transfer_success_total"],
-            "transfer_failure_total": self.metrics["transfer_failure_total"],
+            "transfer_success_total": self.transfer_success_total,
+            "transfer_failure_total": self.transfer_failure_total,
             "transfer_success_rate": self._calculate_success_rate(),
-            "retry_count": self.metrics["retry_count"],
+            "retry_count": self.retry_count,
             "avg_duration_seconds": self._calculate_avg_duration(),
-            "total_bytes_transferred": sum(self.metrics["transfer_bytes"])
+            "total_bytes_transferred": self._bytes_sum
         }
     
     def _calculate_success_rate(self) -> float:
         """Calculate success rate percentage."""
-        total = self.metrics["transfer_success_total"] + self.metrics["transfer_failure_total"]
+        total = self.transfer_success_total + self.transfer_failure_total
         if total == 0:
             return 100.0
-        return (self.metrics["transfer_success_total"] / total) * 100
+        return (self.transfer_success_total / total) * 100
     
     def _calculate_avg_duration(self) -> float:
         """Calculate average transfer duration."""
-        durations = self.metrics["transfer_duration_seconds"]
-        if not durations:
+        count = self.transfer_success_total
+        if count == 0:
             return 0.0
-        return sum(durations) / len(durations)
+        return self._duration_sum / count
 
 class StorageSimulator:
     """Simulates cloud storage operations for local testing."""
     
-    def __init__(self, base_dir: str = "./storage_simulator"):
+    def __init__(self, base_dir: str = "./storage_simulator", in_memory: bool = False):
         self.base_dir = Path(base_dir)
-        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self._base_path = str(self.base_dir)
+        self.in_memory = in_memory
+        # In-memory backend: (provider, bucket, key) -> object bytes
+        self._objects: Dict[Tuple[str, str, str], bytes] = {}
+        if not in_memory:
+            self.base_dir.mkdir(parents=True, exist_ok=True)
         self.failure_injection = False
-        self.failure_count = 0
+        # Each storage call consumes one entry; a yielded number means fail that call
+        self._failure_schedule: Iterator[int] = iter(())
     
-    def _get_storage_path(self, provider: str, bucket: str, key: str) -> Path:
+    def _get_storage_path(self, provider: str, bucket: str, key: str) -> str:
         """Get local path for simulated storage."""
-        return self.base_dir / provider / bucket / key
+        return os.path.join(self._base_path, provider, bucket, key)
+    
+    def _get_source_path(self, provider: str, bucket: str, key: str) -> str:
+        """
+        Get local path for a source object, creating dummy content if missing.
+        
+        Touches the filesystem, so async callers run it in a worker thread.
+        """
+        path = self._get_storage_path(provider, bucket, key)
+        if not os.path.exists(path):
+            # Create dummy file for simulation
+            dummy_data = f"Simulated content for {key}".encode()
+            with _create_in_dir(path, functools.partial(open, mode="wb")) as f:
+                f.write(dummy_data)
+        return path
     
-    async def upload(self, provider: str, bucket: str, key: str, data: bytes):
-        """Simulate upload operation."""
+    async def upload(
+        self,
+        provider: str,
+        bucket: str,
+        key: str,
+        data: Union[bytes, AsyncIterable[bytes]]
+    ):
+        """Simulate upload operation from bytes or an async stream of chunks."""
         # Simulate network delay
         await asyncio.sleep(0.1)
         
         # Inject failures for testing
-        if self.failure_injection and self.failure_count < 2:
-            self.failure_count += 1
-            raise Exception(f"Simulated upload failure #{self.failure_count}")
+        failure = next(self._failure_schedule, None)
+        if failure is not None:
+            raise Exception(f"Simulated upload failure #{failure}")
+        
+        if self.in_memory:
+            if not isinstance(data, bytes):
+                data = b"".join([chunk async for chunk in data])
+            self._objects[(provider, bucket, key)] = data
+            return
         
         path = self._get_storage_path(provider, bucket, key)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_bytes(data)
+        # Write to a temporary file and rename when complete, so a stream that
+        # fails midway never leaves a partial object behind
+        part_path = f"{path}.{uuid.uuid4().hex}.part"
+        f = None
+        try:
+            # Every blocking file call runs in a worker thread so a slow disk
+            # never stalls other transfers on the event loop
+            opening = asyncio.ensure_future(asyncio.to_thread(
+                _create_in_dir, part_path, functools.partial(open, mode="wb")
+            ))
+            try:
+                f = await asyncio.shield(opening)
+            except asyncio.CancelledError:
+                # The thread still creates the file after we are cancelled; wait
+                # for it so the cleanup below can close and delete it
+                with contextlib.suppress(Exception):
+                    f = await opening
+                raise
+            if isinstance(data, bytes):
+                await asyncio.to_thread(f.write, data)
+            else:
+                async for chunk in data:
+                    await asyncio.to_thread(f.write, chunk)
+            await asyncio.to_thread(_commit_part, f, part_path, path)
+        except BaseException:
+            await asyncio.to_thread(_discard_part, f, part_path)
+            raise
+    
+    async def iter_chunks(
+        self,
+        provider: str,
+        bucket: str,
+        key: str,
+        chunk_size: int = CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """Simulate a streaming download, yielding the object in chunks."""
+        # Simulate network delay
+        await asyncio.sleep(0.1)
+        
+        # Inject failures for testing
+        failure = next(self._failure_schedule, None)
+        if failure is not None:
+            raise Exception(f"Simulated download failure #{failure}")
+        
+        if self.in_memory:
+            data = self._objects.setdefault(
+                (provider, bucket, key), f"Simulated content for {key}".encode()
+            )
+            for offset in range(0, len(data), chunk_size):
+                yield data[offset:offset + chunk_size]
+            return
+        
+        path = await asyncio.to_thread(self._get_source_path, provider, bucket, key)
+        f = await asyncio.to_thread(open, path, "rb")
+        try:
+            while chunk := await asyncio.to_thread(f.read, chunk_size):
+                yield chunk
+        finally:
+            # Nothing to flush for a reader, so closing inline doesn't block
+            f.close()
     
     async def download(self, provider: str, bucket: str, key: str) -> bytes:
         """Simulate download operation."""
+        return b"".join([chunk async for chunk in self.iter_chunks(provider, bucket, key)])
+    
+    async def copy(
+        self,
+        source: Dict[str, str],
+        destination: Dict[str, str]
+    ) -> int:
+        """
+        Simulate a server-side copy that never passes data through the worker.
+        
+        Returns:
+            int: Number of bytes copied
+        """
         # Simulate network delay
         await asyncio.sleep(0.1)
         
         # Inject failures for testing
-        if self.failure_injection and self.failure_count < 2:
-            self.failure_count += 1
-            raise Exception(f"Simulated download failure #{self.failure_count}")
+        failure = next(self._failure_schedule, None)
+        if failure is not None:
+            raise Exception(f"Simulated copy failure #{failure}")
         
-        path = self._get_storage_path(provider, bucket, key)
-        if not path.exists():
-            # Create dummy file for simulation
-            path.parent.mkdir(parents=True, exist_ok=True)
-            dummy_data = f"Simulated content for {key}".encode()
-            path.write_bytes(dummy_data)
+        if self.in_memory:
+            # Objects are immutable bytes, so the destination can share them
+            data = self._objects.setdefault(
+                (source["provider"], source["bucket"], source["key"]),
+                f"Simulated content for {source['key']}".encode()
+            )
+            dst_key = (destination["provider"], destination["bucket"], destination["key"])
+            self._objects[dst_key] = data
+            return len(data)
         
-        return path.read_bytes()
+        dst_path = self._get_storage_path(
+            destination["provider"], destination["bucket"], destination["key"]
+        )
+        part_path = f"{dst_path}.{uuid.uuid4().hex}.part"
+        
+        def copy_into_place() -> int:
+            src_path = self._get_source_path(source["provider"], source["bucket"], source["key"])
+            try:
+                # copyfile copies in the kernel (sendfile on Linux), skipping user-space buffers
+                _create_in_dir(part_path, functools.partial(shutil.copyfile, src_path))
+                os.replace(part_path, dst_path)
+            except BaseException:
+                _remove_if_exists(part_path)
+                raise
+            return os.path.getsize(dst_path)
+        
+        # One thread hop for the whole copy, cleanup included, keeps the event
+        # loop free; if this task is cancelled the thread still finishes or cleans up
+        return await asyncio.to_thread(copy_into_place)
     
     def enable_failure_injection(self):
         """Enable failure injection for testing."""
         self.failure_injection = True
-        self.failure_count = 0
+        self._failure_schedule = iter((1, 2))
     
     def disable_failure_injection(self):
         """Disable failure injection."""
         self.failure_injection = False
-        self.failure_count = 0
+        self._failure_schedule = iter(())
+
+class IdempotencyCache:
+    """
+    Bounded set of processed event IDs.
+    
+    IDs are kept in two generations of plain sets. When the current generation
+    reaches max_size it replaces the previous one, whose IDs are forgotten. The
+    most recent max_size IDs are always remembered and memory never exceeds
+    2 * max_size entries. UUID event IDs are stored as their 16 raw bytes.
+    """
+    
+    def __init__(self, max_size: int = 100_000):
+        self.max_size = max_size
+        self._current: Set[Union[bytes, str]] = set()
+        self._previous: Set[Union[bytes, str]] = set()
+    
+    @staticmethod
+    def key(event_id: str) -> Union[bytes, str]:
+        """Compact key for an event ID; non-UUID IDs are kept as-is."""
+        try:
+            return uuid.UUID(event_id).bytes
+        except ValueError:
+            return event_id
+    
+    def __contains__(self, event_id: str) -> bool:
+        key = self.key(event_id)
+        return key in self._current or key in self._previous
+    
+    def __len__(self) -> int:
+        return len(self._current) + len(self._previous)
+    
+    def add(self, event_id: str):
+        """Record an event ID, rotating generations when the current one is full."""
+        key = self.key(event_id)
+        self._previous.discard(key)
+        self._current.add(key)
+        if len(self._current) >= self.max_size:
+            self._previous = self._current
+            self._current = set()
 
 class TransferWorker:
     """Main transfer worker implementation."""
@@ -236,15 +560,65 @@ class TransferWorker:
         self,
         storage: Optional[StorageSimulator] = None,
         retry_config: Optional[RetryConfig] = None,
-        enable_dlq: bool = True
+        enable_dlq: bool = True,
+        max_processed_events: int = 100_000,
+        max_concurrency: int = 32,
+        dlq_max_size: int = 10_000
     ):
         self.storage = storage or StorageSimulator()
         self.retry_config = retry_config or RetryConfig()
         self.enable_dlq = enable_dlq
         self.logger = StructuredLogger()
         self.metrics = MetricsCollector()
-        self.processed_events: Set[str] = set()  # Idempotency tracking
-        self.dlq: list = []  # Dead letter queue
+        self.processed_events = IdempotencyCache(max_processed_events)  # Idempotency tracking
+        # Dead letter queue; keeps the newest dlq_max_size entries
+        self.dlq: collections.deque = collections.deque(maxlen=dlq_max_size)
+        self.dlq_total = 0  # Events ever sent to the DLQ, including evicted ones
+        self.max_concurrency = max_concurrency
+        self._transfer_slots = asyncio.Semaphore(max_concurrency)  # Caps in-flight transfers
+        # Outcome of each event being transferred right now, shared with duplicate deliveries
+        self._in_flight: Dict[Union[bytes, str], asyncio.Future] = {}
+    
+    async def run(
+        self,
+        queue: "QueueSimulator",
+        batch_size: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> int:
+        """
+        Consume events from the queue, processing each batch concurrently.
+        
+        Waits up to timeout seconds for the first message of a batch (forever
+        if None), then adds whatever is already queued, up to batch_size
+        messages. Messages that cannot be decoded are logged and dropped.
+        
+        Returns:
+            int: Number of messages consumed before the queue went idle
+        """
+        batch_size = batch_size or self.max_concurrency
+        processed = 0
+        
+        while True:
+            batch = await queue.receive_batch(batch_size, timeout=timeout)
+            if not batch:
+                return processed
+            
+            events = []
+            for raw in batch:
+                try:
+                    events.append(TransferEvent.from_bytes(raw))
+                except (ValueError, KeyError, TypeError) as e:
+                    # A malformed message can never succeed, so retrying it is pointless
+                    self.logger.error("Discarding undecodable message", error=str(e))
+            
+            results = await asyncio.gather(
+                *(self.process_event(e) for e in events),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    self.logger.error("Unhandled error processing event", error=str(result))
+            processed += len(batch)
     
     async def process_event(self, event: TransferEvent) -> bool:
         """
@@ -256,61 +630,127 @@ class TransferWorker:
         # Set logging context
         self.logger.set_context(event.correlation_id, event.event_id)
         
-        # Check idempotency
-        if event.event_id in self.processed_events:
+        # Same normalized key as processed_events, so both checks agree on duplicates
+        key = IdempotencyCache.key(event.event_id)
+        while True:
+            # Check idempotency
+            if event.event_id in self.processed_events:
+                self.logger.info(
+                    "Event already processed (idempotent check)",
+                    event_id=event.event_id
+                )
+                return True
+            
+            # A duplicate delivered while the first copy is still transferring waits
+            # for that outcome instead of copying the object a second time
+            pending = self._in_flight.get(key)
+            if pending is None:
+                break
             self.logger.info(
-                "Event already processed (idempotent check)",
+                "Event already in progress (idempotent check)",
                 event_id=event.event_id
             )
-            return True
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # Our own cancellation propagates; if only the first delivery was
+                # cancelled, check again and transfer the event ourselves if needed
+                if not pending.cancelled():
+                    raise
         
+        # Registered before the first await, so no concurrent duplicate can miss it
+        pending = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = pending
+        try:
+            result = await self._transfer_with_retries(event)
+        except Exception as e:
+            pending.set_exception(e)
+            pending.exception()  # Mark retrieved; waiters re-raise it themselves
+            raise
+        except BaseException:
+            pending.cancel()
+            raise
+        else:
+            pending.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
+    
+    async def _transfer_with_retries(self, event: TransferEvent) -> bool:
+        """
+        Run the transfer, retrying failures and dead-lettering the event at the end.
+        
+        Returns:
+            bool: True if transfer successful, False otherwise
+        """
         self.logger.info(
             "Starting transfer",
             source=event.source,
             destination=event.destination
         )
         
-        start_time = time.time()
+        # Bind attributes used on every attempt to locals once
+        max_attempts = self.retry_config.max_attempts
+        record_retry = self.metrics.record_retry
+        log_info = self.logger.info
+        log_err = self.logger.error
+        backoff = self._calculate_backoff_delay
+        sleep = asyncio.sleep
+        
+        start_time = time.monotonic()
         attempt = 0
         
-        while attempt < self.retry_config.max_attempts:
+        while attempt < max_attempts:
             try:
                 attempt += 1
                 if attempt > 1:
-                    self.metrics.record_retry()
-                    self.logger.info(f"Retry attempt {attempt}/{self.retry_config.max_attempts}")
+                    record_retry()
+                    log_info(f"Retry attempt {attempt}/{max_attempts}")
                 
-                # Execute transfer
-                bytes_transferred = await self._execute_transfer(event)
+                # Execute transfer; backoff waits happen outside the slot
+                async with self._transfer_slots:
+                    bytes_transferred = await self._execute_transfer(event)
                 
                 # Record success
-                duration = time.time() - start_time
+                duration = time.monotonic() - start_time
                 self.metrics.record_success(duration, bytes_transferred)
                 self.processed_events.add(event.event_id)
                 
-                self.logger.info(
+                log_info(
                     "Transfer completed successfully",
                     duration_seconds=duration,
                     bytes_transferred=bytes_transferred
                 )
                 return True
                 
+            except UnrecoverableTransferError as e:
+                # Retrying cannot help - send straight to DLQ
+                log_err(
+                    f"Transfer failed permanently on attempt {attempt}",
+                    error=str(e),
+                    attempt=attempt
+                )
+                self.metrics.record_failure()
+                if self.enable_dlq:
+                    await self._send_to_dlq(event, str(e), attempt)
+                return False
+                
             except Exception as e:
-                self.logger.error(
+                log_err(
                     f"Transfer failed on attempt {attempt}",
                     error=str(e),
                     attempt=attempt
                 )
                 
-                if attempt < self.retry_config.max_attempts:
-                    delay = self._calculate_backoff_delay(attempt)
-                    self.logger.info(f"Waiting {delay}ms before retry")
-                    await asyncio.sleep(delay / 1000)
+                if attempt < max_attempts:
+                    delay = backoff(attempt)
+                    log_info(f"Waiting {delay}ms before retry")
+                    await sleep(delay / 1000)
                 else:
                     # Max retries exceeded - send to DLQ
                     self.metrics.record_failure()
                     if self.enable_dlq:
-                        await self._send_to_dlq(event, str(e))
+                        await self._send_to_dlq(event, str(e), attempt)
                     return False
         
         return False
@@ -322,56 +762,112 @@ class TransferWorker:
         Returns:
             int: Number of bytes transferred
         """
-        # Download from source
-        self.logger.info("Downloading from source", provider=event.source["provider"])
-        data = await self.storage.download(
-            event.source["provider"],
-            event.source["bucket"],
-            event.source["key"]
+        source, destination = event.source, event.destination
+        src_provider, src_bucket, src_key = source["provider"], source["bucket"], source["key"]
+        dst_provider, dst_bucket, dst_key = (
+            destination["provider"], destination["bucket"], destination["key"]
         )
         
-        # Verify checksum if provided
-        if "checksumSHA256" in event.metadata:
-            calculated_checksum = hashlib.sha256(data).hexdigest()
-            expected_checksum = event.metadata["checksumSHA256"]
+        # BLAKE3 is much faster than SHA-256 for integrity checks, so prefer it when
+        # given; without the blake3 package, fall back to SHA-256 if that is given too
+        metadata = event.metadata
+        hasher: Any
+        if "checksumBLAKE3" in metadata and blake3 is not None:
+            expected_checksum = metadata["checksumBLAKE3"]
+            hasher = blake3()
+        elif "checksumBLAKE3" in metadata and "checksumSHA256" not in metadata:
+            raise UnrecoverableTransferError(
+                "checksumBLAKE3 requires the blake3 package, which is not installed"
+            )
+        else:
+            expected_checksum = metadata.get("checksumSHA256")
+            hasher = hashlib.sha256()
+        
+        if expected_checksum is None:
+            # Nothing to verify, so let storage copy directly without streaming through us
+            self.logger.info(
+                "Copying from source to destination",
+                source_provider=src_provider,
+                destination_provider=dst_provider
+            )
+            return await self.storage.copy(source, destination)
+        
+        bytes_transferred = 0
+        # Bounded buffer between download and upload; None marks end of stream
+        chunks: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_DEPTH)
+        
+        async def produce():
+            """Download and hash source chunks, handing them to the uploader."""
+            nonlocal bytes_transferred
+            async for chunk in self.storage.iter_chunks(src_provider, src_bucket, src_key):
+                bytes_transferred += len(chunk)
+                if len(chunk) >= HASH_OFFLOAD_MIN_BYTES:
+                    # Each update finishes before the next starts, keeping the digest ordered
+                    await asyncio.gather(asyncio.to_thread(hasher.update, chunk), chunks.put(chunk))
+                else:
+                    hasher.update(chunk)
+                    await chunks.put(chunk)
             
+            # Verify checksum before letting the upload commit the object
+            calculated_checksum = hasher.hexdigest()
             if calculated_checksum != expected_checksum:
-                raise ValueError(
+                raise UnrecoverableTransferError(
                     f"Checksum mismatch: expected={expected_checksum}, "
                     f"calculated={calculated_checksum}"
                 )
+            await chunks.put(None)
         
-        # Upload to destination
-        self.logger.info("Uploading to destination", provider=event.destination["provider"])
-        await self.storage.upload(
-            event.destination["provider"],
-            event.destination["bucket"],
-            event.destination["key"],
-            data
-        )
+        async def drain() -> AsyncIterator[bytes]:
+            while (chunk := await chunks.get()) is not None:
+                yield chunk
+        
+        # Download and upload run concurrently, so the slower side sets the pace
+        self.logger.info("Downloading from source", provider=src_provider)
+        self.logger.info("Uploading to destination", provider=dst_provider)
+        producer = asyncio.create_task(produce())
+        consumer = asyncio.create_task(self.storage.upload(
+            dst_provider,
+            dst_bucket,
+            dst_key,
+            drain()
+        ))
+        try:
+            await asyncio.gather(producer, consumer)
+        finally:
+            # If either side failed, stop the other so it can't block on the queue
+            producer.cancel()
+            consumer.cancel()
+            await asyncio.gather(producer, consumer, return_exceptions=True)
         
-        return len(data)
+        return bytes_transferred
     
     def _calculate_backoff_delay(self, attempt: int) -> int:
-        """Calculate exponential backoff delay in milliseconds."""
+        """Calculate exponential backoff delay with jitter in milliseconds."""
         delay = min(
             self.retry_config.initial_delay_ms * (self.retry_config.multiplier ** (attempt - 1)),
             self.retry_config.max_delay_ms
         )
+        # Spread retries so workers hit by the same outage don't retry in lockstep.
+        # Jitter only shortens the capped delay, so delays stay spread at the cap too
+        jitter = self.retry_config.jitter
+        if jitter:
+            delay = random.uniform(delay * (1 - jitter), delay)
         return int(delay)
     
-    async def _send_to_dlq(self, event: TransferEvent, error: str):
+    async def _send_to_dlq(self, event: TransferEvent, error: str, attempts: int):
         """Send failed event to dead letter queue."""
         dlq_entry = {
             "event": event.to_json(),
             "error": error,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "attempts": self.retry_config.max_attempts
+            "timestamp": _utc_now_iso(),
+            "attempts": attempts
         }
         self.dlq.append(dlq_entry)
+        self.dlq_total += 1
         self.logger.error(
             "Event sent to DLQ",
-            dlq_size=len(self.dlq)
+            dlq_size=len(self.dlq),
+            dlq_total=self.dlq_total
         )
     
     def get_health_status(self) -> Dict[str, Any]:
@@ -379,39 +875,68 @@ class TransferWorker:
         metrics = self.metrics.get_metrics()
         return {
             "status": "healthy" if metrics["transfer_success_rate"] > 95 else "degraded",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": _utc_now_iso(),
             "metrics": metrics,
-            "dlq_size": len(self.dlq)
+            "dlq_size": len(self.dlq),
+            "dlq_total": self.dlq_total
         }
     
     def get_readiness_status(self) -> Dict[str, Any]:
         """Get readiness check status."""
         return {
             "ready": True,
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": _utc_now_iso()
         }
 
 class QueueSimulator:
-    """Simulates message queue for local testing."""
+    """
+    Simulates message queue for local testing.
+    
+    Like a real queue it carries raw message bodies: events are encoded on
+    send, and consumers decode them with TransferEvent.from_bytes.
+    """
     
     def __init__(self):
         self.queue: asyncio.Queue = asyncio.Queue()
         self.processed_count = 0
     
-    async def send_message(self, event: TransferEvent):
-        """Send message to queue."""
-        await self.queue.put(event)
+    async def send_message(self, event: Union[TransferEvent, bytes]):
+        """Send an event, or an already encoded message body, to the queue."""
+        body = event.to_bytes() if isinstance(event, TransferEvent) else event
+        # Queue is unbounded, so put never has to wait
+        self.queue.put_nowait(body)
     
-    async def receive_message(self, timeout: Optional[float] = None) -> Optional[TransferEvent]:
-        """Receive message from queue."""
+    async def receive_message(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """Receive a message body, waiting up to timeout seconds (forever if None)."""
+        # Fast path: skip the wait_for task when a message is already available
         try:
-            if timeout:
+            return self.queue.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+        try:
+            if timeout is not None:
                 return await asyncio.wait_for(self.queue.get(), timeout=timeout)
             else:
                 return await self.queue.get()
         except asyncio.TimeoutError:
             return None
     
+    async def receive_batch(self, n: int, timeout: Optional[float] = None) -> List[bytes]:
+        """
+        Receive up to n message bodies in one call.
+        
+        Waits up to timeout seconds for the first message (forever if None),
+        then takes whatever else is already queued without waiting again.
+        Returns an empty list if the wait times out.
+        """
+        first = await self.receive_message(timeout=timeout)
+        if first is None:
+            return []
+        batch = [first]
+        while len(batch) < n and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+    
     def get_queue_size(self) -> int:
         """Get current queue size."""
         return self.queue.qsize()
@@ -449,15 +974,16 @@ async def main():
     # Send event to queue
     await queue.send_message(sample_event)
     
-    # Process event
-    event = await queue.receive_message()
-    if event:
-        success = await worker.process_event(event)
-        print(f"\nTransfer {'succeeded' if success else 'failed'}")
+    # Process queued events until the queue goes idle
+    processed = await worker.run(queue, timeout=0.5)
+    print(f"\nProcessed {processed} event(s)")
     
     # Print health status
     health = worker.get_health_status()
     print(f"\nHealth Status: {json.dumps(health, indent=2)}")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
\ No newline at end of file